@@ -25,6 +25,7 @@ import { AssistantPanel } from "./components/AssistantPanel";
 import { useIsMobile, getIsMobileSnapshot } from "./hooks/useIsMobile";
 import { useFullscreen } from "./hooks/useFullscreen";
 import { usePiWebSocket } from "./hooks/usePiWebSocket";
+import { useStickKeepalive } from "./hooks/useStickKeepalive";
 import { useMqtt } from "./hooks/useMqtt";
 import { useVoiceAssistant } from "./hooks/useVoiceAssistant";
 import { useRoverSession } from "./context/RoverSessionContext";
@@ -113,9 +114,13 @@ export default function App() {
   const clearError = () => setActionError(null);
   const clearErrorIfAny = () => setActionError((prev) => (prev ? null : prev));
 
+  // Held sticks are resent at a fixed rate; the driver decays a silent stick to neutral.
+  const trackStick = useStickKeepalive({ enabled: piOnline && Boolean(sendControl), send: sendControl });
+
   const sendControlNow = (payload) => {
     if (piOnline && sendControl) {
       sendControl(payload);
+      trackStick(payload);
       return Promise.resolve();
     }
     const startupGraceActive = Date.now() - mountedAtRef.current < 15000;
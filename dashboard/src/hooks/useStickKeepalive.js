@@ -0,0 +1,62 @@
+import { useRef, useEffect, useCallback } from "react";
+
+/** Resend period for a held analog stick. The rover driver decays a stick to neutral when frames stop. */
+export const STICK_KEEPALIVE_MS = 100;
+const STICK_CENTER_EPSILON = 0.01;
+
+const isOffCenter = (v) =>
+  v != null &&
+  (Math.abs(Number(v.x) || 0) > STICK_CENTER_EPSILON ||
+    Math.abs(Number(v.y) || 0) > STICK_CENTER_EPSILON);
+
+/**
+ * Next held analog state after a control payload is sent.
+ * Keyboard arrays leave analog mode; turn commands drop drive; reset/look_down drop gimbal.
+ */
+export function nextStickHold(prev, payload) {
+  if (Array.isArray(payload)) return { drive: null, gimbal: null };
+  if (!payload || typeof payload !== "object") return prev;
+  if (typeof payload.command === "string") {
+    if (payload.command.startsWith("turn_")) return { ...prev, drive: null };
+    if (payload.command === "reset_servos" || payload.command === "look_down") {
+      return { ...prev, gimbal: null };
+    }
+    return prev;
+  }
+  const next = { ...prev };
+  if ("drive" in payload) next.drive = payload.drive ?? null;
+  if ("gimbal" in payload) next.gimbal = payload.gimbal ?? null;
+  return next;
+}
+
+/**
+ * While a drive or gimbal stick is off-center, resend it every STICK_KEEPALIVE_MS.
+ * Joystick/gamepad senders only emit on change, so a held stick would otherwise go silent.
+ * @param {{ enabled: boolean, send: (payload: object) => void, intervalMs?: number }} options
+ * @returns {(payload: unknown) => void} call with every control payload sent to the rover
+ */
+export function useStickKeepalive({ enabled, send, intervalMs = STICK_KEEPALIVE_MS }) {
+  const holdRef = useRef({ drive: null, gimbal: null });
+  const sendRef = useRef(send);
+
+  useEffect(() => {
+    sendRef.current = send;
+  }, [send]);
+
+  useEffect(() => {
+    if (!enabled) return undefined;
+    const id = setInterval(() => {
+      const { drive, gimbal } = holdRef.current;
+      if (!isOffCenter(drive) && !isOffCenter(gimbal)) return;
+      const payload = {};
+      if (drive) payload.drive = drive;
+      if (gimbal) payload.gimbal = gimbal;
+      sendRef.current?.(payload);
+    }, intervalMs);
+    return () => clearInterval(id);
+  }, [enabled, intervalMs]);
+
+  return useCallback((payload) => {
+    holdRef.current = nextStickHold(holdRef.current, payload);
+  }, []);
+}
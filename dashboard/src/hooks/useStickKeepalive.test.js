@@ -0,0 +1,62 @@
+import { describe, it, expect, vi, afterEach } from "vitest";
+import { renderHook, act } from "@testing-library/react";
+import { useStickKeepalive, nextStickHold, STICK_KEEPALIVE_MS } from "./useStickKeepalive.js";
+
+describe("nextStickHold", () => {
+  const held = { drive: { x: 0, y: -0.8 }, gimbal: { x: 0.3, y: 0 } };
+
+  it("tracks drive and gimbal from analog payloads", () => {
+    expect(nextStickHold({ drive: null, gimbal: null }, { drive: { x: 0.5, y: 0 } })).toEqual({
+      drive: { x: 0.5, y: 0 },
+      gimbal: null,
+    });
+  });
+
+  it("keyboard arrays leave analog mode", () => {
+    expect(nextStickHold(held, ["w"])).toEqual({ drive: null, gimbal: null });
+  });
+
+  it("turn commands drop drive, reset drops gimbal, others keep both", () => {
+    expect(nextStickHold(held, { command: "turn_left_90_slow" }).drive).toBeNull();
+    expect(nextStickHold(held, { command: "reset_servos" }).gimbal).toBeNull();
+    expect(nextStickHold(held, { command: "toggle_laser" })).toBe(held);
+  });
+});
+
+describe("useStickKeepalive", () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("resends an off-center stick until it is centered", () => {
+    vi.useFakeTimers();
+    const send = vi.fn();
+    const { result } = renderHook(() => useStickKeepalive({ enabled: true, send }));
+    act(() => {
+      result.current({ drive: { x: 0, y: -0.9 }, gimbal: { x: 0, y: 0 } });
+    });
+    act(() => {
+      vi.advanceTimersByTime(STICK_KEEPALIVE_MS * 3);
+    });
+    expect(send).toHaveBeenCalledTimes(3);
+    expect(send).toHaveBeenLastCalledWith({ drive: { x: 0, y: -0.9 }, gimbal: { x: 0, y: 0 } });
+
+    send.mockClear();
+    act(() => {
+      result.current({ drive: { x: 0, y: 0 } });
+      vi.advanceTimersByTime(STICK_KEEPALIVE_MS * 3);
+    });
+    expect(send).not.toHaveBeenCalled();
+  });
+
+  it("does nothing while disabled", () => {
+    vi.useFakeTimers();
+    const send = vi.fn();
+    const { result } = renderHook(() => useStickKeepalive({ enabled: false, send }));
+    act(() => {
+      result.current({ drive: { x: 1, y: 0 } });
+      vi.advanceTimersByTime(STICK_KEEPALIVE_MS * 3);
+    });
+    expect(send).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,5 @@
+import os
+
+# Host /tmp is mounted at /app/shared in the control_server container (also used for shutdown.req).
+# Debian clears host /tmp at boot, so anything meant to survive a reboot should use its own mount.
+SHARED_DIR = "/app/shared" if os.path.isdir("/app/shared") else "/tmp"
@@ -0,0 +1,157 @@
+import os
+import gc
+import sys
+import time
+import cProfile
+import pstats
+
+from DriverPaths import SHARED_DIR
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or SHARED_DIR
+MAX_PROFILE_SECONDS = 60.0
+DEFAULT_PROFILE_SECONDS = 10.0
+DEFAULT_TOP_N = 15
+
+
+class DriverProfiler:
+    """On-demand cProfile window plus process CPU/RSS/GC counters for a driver process."""
+
+    def __init__(self, name):
+        self.name = name
+        self._profile = None
+        self._started_at = 0.0
+        self._stop_at = 0.0
+        self._top_n = DEFAULT_TOP_N
+        self._last_cpu = self._cpu_seconds()
+        self._last_wall = time.monotonic()
+        try:
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+        except (ValueError, OSError, AttributeError):
+            self._page_size = 4096
+
+    @property
+    def active(self):
+        return self._profile is not None
+
+    def start(self, duration=None, top=None):
+        """Start a bounded profiling window; returns the status message for stdout."""
+        if self._profile is not None:
+            return {"type": "profile_status", "name": self.name, "active": True,
+                    "message": "profile already running"}
+        try:
+            duration = float(duration) if duration is not None else DEFAULT_PROFILE_SECONDS
+        except (TypeError, ValueError):
+            duration = DEFAULT_PROFILE_SECONDS
+        duration = max(0.1, min(MAX_PROFILE_SECONDS, duration))
+        try:
+            self._top_n = max(1, int(top)) if top is not None else DEFAULT_TOP_N
+        except (TypeError, ValueError):
+            self._top_n = DEFAULT_TOP_N
+        self._profile = cProfile.Profile()
+        self._started_at = time.monotonic()
+        self._stop_at = self._started_at + duration
+        self._profile.enable()
+        return {"type": "profile_status", "name": self.name, "active": True, "duration": duration}
+
+    def time_left(self):
+        """Seconds until the running window closes, or None when idle (usable as a select timeout)."""
+        if self._profile is None:
+            return None
+        return max(0.0, self._stop_at - time.monotonic())
+
+    def poll(self):
+        """Close the window once its deadline passes; returns the report or None."""
+        if self._profile is not None and time.monotonic() >= self._stop_at:
+            return self.stop()
+        return None
+
+    def stop(self):
+        """Stop profiling, dump full stats to PROFILE_DIR and return the top hotspots."""
+        if self._profile is None:
+            return {"type": "profile_status", "name": self.name, "active": False,
+                    "message": "no profile running"}
+        profile = self._profile
+        profile.disable()
+        self._profile = None
+        elapsed = time.monotonic() - self._started_at
+
+        stats = pstats.Stats(profile)
+        path = os.path.join(PROFILE_DIR, "%s-%s.prof" % (self.name, time.strftime("%Y%m%d-%H%M%S")))
+        try:
+            stats.dump_stats(path)
+        except OSError as e:
+            sys.stderr.write("[profile] Could not write %s: %s\n" % (path, e))
+            sys.stderr.flush()
+            path = None
+
+        # stats.stats: (file, line, func) -> (primitive calls, calls, tottime, cumtime, callers)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        hotspots = []
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in rows[:self._top_n]:
+            hotspots.append({
+                "func": "%s:%d(%s)" % (os.path.basename(filename), line, func),
+                "calls": calls,
+                "tottime_ms": round(tottime * 1000.0, 3),
+                "cumtime_ms": round(cumtime * 1000.0, 3),
+            })
+        return {
+            "type": "profile_report",
+            "name": self.name,
+            "elapsed": round(elapsed, 3),
+            "total_calls": stats.total_calls,
+            "hotspots": hotspots,
+            "file": path,
+            "process": self.process_stats(),
+        }
+
+    def process_stats(self):
+        """CPU usage since the previous call, current RSS and GC counters."""
+        now = time.monotonic()
+        cpu = self._cpu_seconds()
+        wall = now - self._last_wall
+        cpu_pct = (cpu - self._last_cpu) / wall * 100.0 if wall > 0 else 0.0
+        self._last_cpu = cpu
+        self._last_wall = now
+        return {
+            "cpu_percent": round(cpu_pct, 1),
+            "cpu_seconds": round(cpu, 3),
+            "rss_kb": self._rss_kb(),
+            "max_rss_kb": self._max_rss_kb(),
+            "gc_counts": list(gc.get_count()),
+            "gc_collections": [s.get("collections", 0) for s in gc.get_stats()],
+            "gc_collected": [s.get("collected", 0) for s in gc.get_stats()],
+        }
+
+    def handle_command(self, data):
+        """Handle start_profile / stop_profile / get_stats; returns a message or None if not ours."""
+        command = data.get("command") if isinstance(data, dict) else None
+        if command == "start_profile":
+            return self.start(data.get("duration"), data.get("top"))
+        if command == "stop_profile":
+            return self.stop()
+        if command == "get_stats":
+            return {"type": "process_stats", "name": self.name, "profiling": self.active,
+                    **self.process_stats()}
+        return None
+
+    @staticmethod
+    def _cpu_seconds():
+        t = os.times()
+        return t.user + t.system
+
+    def _rss_kb(self):
+        """Current resident set size; None where /proc is unavailable."""
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_size // 1024
+        except (OSError, ValueError, IndexError):
+            return None
+
+    @staticmethod
+    def _max_rss_kb():
+        """Peak resident set size since process start (ru_maxrss is in KiB on Linux)."""
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except Exception:
+            return None
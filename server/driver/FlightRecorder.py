@@ -0,0 +1,264 @@
+import os
+import sys
+import mmap
+import glob
+import array
+import struct
+import threading
+import time
+
+from DriverPaths import SHARED_DIR
+
+# docker-compose points this at ./flight on the SD card; the SHARED_DIR fallback is wiped at boot
+RECORDER_DIR = os.environ.get("FLIGHT_RECORDER_DIR") or os.path.join(SHARED_DIR, "flight")
+SEGMENT_BYTES = int(os.environ.get("FLIGHT_RECORDER_SEGMENT_BYTES", 4 * 1024 * 1024))
+MAX_TOTAL_BYTES = int(os.environ.get("FLIGHT_RECORDER_MAX_BYTES", 64 * 1024 * 1024))
+
+# Segment layout (native byte order, little-endian on the Pi):
+#   header (HEADER_SIZE bytes): magic, version, column count, capacity, row count, wall-clock and
+#   monotonic time at which the segment started recording, then per column a 15-byte name + 1-byte
+#   array typecode; followed by one contiguous, 8-byte aligned region per column holding `capacity`
+#   values. Rows are appended by writing into each column region.
+MAGIC = b"RVFR"
+VERSION = 2
+HEADER_SIZE = 512
+_HEAD = struct.Struct("<4sHHIIdd")
+_COL = struct.Struct("15s1s")
+_COUNT_OFFSET = 12
+_CLOCK = struct.Struct("<dd")
+_CLOCK_OFFSET = 16
+MAX_COLUMNS = (HEADER_SIZE - _HEAD.size) // _COL.size
+
+# (column name, array typecode). "t" is time.monotonic() (CLOCK_MONOTONIC, system-wide on Linux),
+# so rows from both processes join on it and NTP steps do not break the series. The monotonic clock
+# restarts at boot, so each segment header also pins (time.time(), time.monotonic()) taken together:
+# wall time of a row = wall_clock + (t - monotonic).
+# rover_driver rows are written at FLIGHT_RECORDER_HZ from the driver loop; telemetry_monitor rows at
+# FLIGHT_RECORDER_TELEMETRY_HZ (each sample is nine I2C block reads, so keep it modest).
+DRIVE_COLUMNS = (
+    ("t", "d"),
+    ("m1_cmd", "h"), ("m2_cmd", "h"), ("m3_cmd", "h"), ("m4_cmd", "h"),
+    ("m1_mm_s", "f"), ("m2_mm_s", "f"), ("m3_mm_s", "f"), ("m4_mm_s", "f"),
+    ("pan", "f"), ("tilt", "f"),
+    ("laser", "B"),
+)
+TELEMETRY_COLUMNS = (
+    ("t", "d"),
+    ("m1_enc", "i"), ("m2_enc", "i"), ("m3_enc", "i"), ("m4_enc", "i"),
+    ("voltage", "f"),
+)
+
+
+def _align8(n):
+    return (n + 7) & ~7
+
+
+def _layout(columns, capacity):
+    """Byte offset of each column region and the total segment size."""
+    offsets = []
+    pos = HEADER_SIZE
+    for _, code in columns:
+        offsets.append(pos)
+        pos = _align8(pos + array.array(code).itemsize * capacity)
+    return offsets, pos
+
+
+class FlightRecorder:
+    """Appends fixed-width rows to preallocated, memory-mapped columnar segment files.
+
+    A row write is a handful of memoryview stores into the mapping, so there are no per-sample
+    syscalls. The next segment is created, preallocated, mapped and old ones pruned on a background
+    thread while the current one fills, so a rollover inside the caller's control loop only swaps
+    mappings. The row count lives in the mapped header, so a crash loses nothing the kernel has
+    already been handed.
+    """
+
+    def __init__(self, name, columns, directory=None, segment_bytes=None, max_total_bytes=None):
+        if len(columns) > MAX_COLUMNS:
+            raise ValueError("too many columns for a %d-byte header" % HEADER_SIZE)
+        self.name = name
+        self.columns = tuple(columns)
+        self.directory = directory or RECORDER_DIR
+        segment_bytes = segment_bytes or SEGMENT_BYTES
+        row_bytes = sum(array.array(code).itemsize for _, code in self.columns)
+        self.capacity = max(1, (segment_bytes - HEADER_SIZE - 8 * len(self.columns)) // row_bytes)
+        self._offsets, self.segment_size = _layout(self.columns, self.capacity)
+        self.max_segments = max(2, (max_total_bytes or MAX_TOTAL_BYTES) // self.segment_size)
+        self._mm = None
+        self._views = []
+        self.count = 0
+        self.path = None
+        self.wall_clock = None
+        self.monotonic = None
+        self._next = None
+        self._next_error = None
+        self._preparer = None
+        os.makedirs(self.directory, exist_ok=True)
+        existing = self.segments()
+        self._seq = self._seq_of(existing[-1]) + 1 if existing else 0
+        self._activate(*self._create_segment())
+
+    def segments(self):
+        """This recorder's segment files, oldest first."""
+        return sorted(glob.glob(os.path.join(self.directory, "%s-*.frec" % self.name)))
+
+    @staticmethod
+    def _seq_of(path):
+        try:
+            return int(os.path.basename(path).rsplit("-", 1)[1].split(".", 1)[0])
+        except (IndexError, ValueError):
+            return 0
+
+    def _create_segment(self):
+        """Create, preallocate and map the next segment file (empty header); returns (path, mmap)."""
+        path = os.path.join(self.directory, "%s-%06d.frec" % (self.name, self._seq))
+        self._seq += 1
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            try:
+                # Reserve real blocks up front so the SD card is not extended page by page
+                os.posix_fallocate(fd, 0, self.segment_size)
+            except (AttributeError, OSError):
+                os.ftruncate(fd, self.segment_size)
+            mm = mmap.mmap(fd, self.segment_size)
+        finally:
+            os.close(fd)
+        _HEAD.pack_into(mm, 0, MAGIC, VERSION, len(self.columns), self.capacity, 0, 0.0, 0.0)
+        for i, (col_name, code) in enumerate(self.columns):
+            _COL.pack_into(mm, _HEAD.size + i * _COL.size, col_name.encode(), code.encode())
+        return path, mm
+
+    def _activate(self, path, mm):
+        """Start recording into a prepared segment and begin preparing the one after it."""
+        self.path = path
+        self._mm = mm
+        self.wall_clock = time.time()
+        self.monotonic = time.monotonic()
+        _CLOCK.pack_into(mm, _CLOCK_OFFSET, self.wall_clock, self.monotonic)
+        whole = memoryview(mm)
+        self._views = []
+        for (_, code), off in zip(self.columns, self._offsets):
+            size = array.array(code).itemsize * self.capacity
+            self._views.append(whole[off:off + size].cast(code))
+        whole.release()
+        self.count = 0
+        self._next = None
+        self._next_error = None
+        self._preparer = threading.Thread(target=self._prepare_next, name="%s-recorder" % self.name,
+                                          daemon=True)
+        self._preparer.start()
+
+    def _prepare_next(self):
+        """Background: preallocate the next segment, then prune so the cap includes it."""
+        try:
+            self._next = self._create_segment()
+        except OSError as e:
+            self._next_error = e
+        self._prune()
+
+    def _rotate(self):
+        """Swap in the preallocated segment; returns False if it could not be created."""
+        self._preparer.join()  # normally finished long before the current segment filled
+        self._close_segment()
+        if self._next is None:
+            sys.stderr.write("[recorder] Rotation failed, recording stopped: %s\n" % self._next_error)
+            sys.stderr.flush()
+            return False
+        self._activate(*self._next)
+        return True
+
+    def _close_segment(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _prune(self):
+        """Size-capped rotation: drop the oldest segments beyond max_segments."""
+        segments = self.segments()
+        for path in segments[:max(0, len(segments) - self.max_segments)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def append(self, row):
+        """Write one row (values in column order)."""
+        if len(row) != len(self.columns):
+            raise ValueError("%s row has %d values, expected %d" % (self.name, len(row), len(self.columns)))
+        if self._mm is None:
+            return
+        if self.count >= self.capacity and not self._rotate():
+            return
+        i = self.count
+        for view, value in zip(self._views, row):
+            view[i] = value
+        self.count = i + 1
+        struct.pack_into("<I", self._mm, _COUNT_OFFSET, self.count)
+
+    def close(self):
+        if self._preparer is not None:
+            self._preparer.join()
+        if self._mm is not None:
+            self._mm.flush()
+        self._close_segment()
+        if self._next is not None:
+            # Drop the preallocated segment that never received a row
+            path, mm = self._next
+            self._next = None
+            mm.close()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def open_recorder(name, columns):
+    """FlightRecorder unless disabled (FLIGHT_RECORDER=0) or the directory is unusable."""
+    if os.environ.get("FLIGHT_RECORDER", "1").lower() in ("0", "false", "no", "off"):
+        return None
+    try:
+        return FlightRecorder(name, columns)
+    except (OSError, ValueError) as e:
+        sys.stderr.write("[recorder] Flight recorder disabled: %s\n" % e)
+        sys.stderr.flush()
+        return None
+
+
+def load_segment(path):
+    """Read a segment: {"wall_clock", "monotonic", "columns": {column name: array.array}}.
+
+    wall_clock / monotonic are time.time() / time.monotonic() when the segment started recording
+    (0.0 for a preallocated segment that never did); columns hold only the recorded rows.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, ncols, capacity, count, wall_clock, monotonic = _HEAD.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("%s is not a flight recorder segment" % path)
+    columns = []
+    for i in range(ncols):
+        col_name, code = _COL.unpack_from(data, _HEAD.size + i * _COL.size)
+        columns.append((col_name.rstrip(b"\0").decode(), code.decode()))
+    offsets, _ = _layout(columns, capacity)
+    result = {}
+    for (col_name, code), off in zip(columns, offsets):
+        values = array.array(code)
+        values.frombytes(data[off:off + values.itemsize * count])
+        result[col_name] = values
+    return {"wall_clock": wall_clock, "monotonic": monotonic, "columns": result}
+
+
+if __name__ == "__main__":
+    # Quick look at a segment: python3 FlightRecorder.py /tmp/flight/rover_driver-000000.frec
+    for seg_path in sys.argv[1:]:
+        seg = load_segment(seg_path)
+        cols = seg["columns"]
+        rows = len(cols.get("t", []))
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seg["wall_clock"]))
+        print("%s: %d rows, started %s (monotonic %.3f)" % (seg_path, rows, started, seg["monotonic"]))
+        for col_name, values in cols.items():
+            if rows:
+                print("  %-10s first=%s last=%s" % (col_name, values[0], values[-1]))
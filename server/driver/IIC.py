@@ -122,18 +122,22 @@ def control_pwm(m1, m2, m3, m4):
 # 读取编码器数据    Read encoder data
 
 
-def read_10_encoder():
-  global encoder_offset
-  formatted_values = []
+def read_10_encoder_raw():
+  # 读取四路10ms编码器增量到 encoder_offset（不格式化字符串）
+  # Read the four 10 ms encoder deltas into encoder_offset (no string formatting; for high-rate sampling)
   for i in range(4):
-    reg = READ_TEN_M1_ENCODER_REG + i
-    buf = i2c_read(MOTOR_MODEL_ADDR, reg, 2)
-    encoder_offset[i] = (buf[0] << 8) | buf[1]
+    buf = i2c_read(MOTOR_MODEL_ADDR, READ_TEN_M1_ENCODER_REG + i, 2)
+    val = (buf[0] << 8) | buf[1]
     # 检查最高位（符号位）是否为 1  Check if the highest bit (sign bit) is 1
-    if encoder_offset[i] & 0x8000:
-      encoder_offset[i] -= 0x10000  # 将其转为负数 Turn it into a negative number
-    formatted_values.append("M{}:{}".format(i + 1, encoder_offset[i]))
-  return ", ".join(formatted_values)
+    if val & 0x8000:
+      val -= 0x10000  # 将其转为负数 Turn it into a negative number
+    encoder_offset[i] = val
+  return encoder_offset
+
+
+def read_10_encoder():
+  read_10_encoder_raw()
+  return ", ".join("M{}:{}".format(i + 1, v) for i, v in enumerate(encoder_offset))
 
 
 def read_all_encoder():
@@ -0,0 +1,131 @@
+import math
+import time
+
+
+def _clamp1(v):
+    return max(-1.0, min(1.0, v))
+
+
+class InputPredictor:
+    """Extrapolates a 2-axis stick (-1..1) between WebSocket frames and decays it to neutral when frames stop.
+
+    Samples are timestamped on arrival. Within `horizon` seconds of a frame the stick leads along its
+    smoothed rate of change; the lead peaks mid-horizon and tapers back to the received value by the
+    end of it, so the output never jumps when the horizon runs out. Only frames that arrive in quick
+    succession (within `max_gap`) and actually move the stick carry a slope: a stick that stops moving
+    stops sending, and the frames the dashboard then resends every 100 ms (useStickKeepalive.js)
+    repeat the held value, so both zero the rate instead of restarting the extrapolation.
+    If no frame arrives for `timeout` seconds the stick ramps to neutral over `decay` seconds, so a lost
+    frame cannot leave it held down; the default timeout tolerates about three lost keepalive frames.
+    """
+
+    PARAMS = ("horizon", "timeout", "decay", "smoothing", "max_rate", "neutral", "max_gap")
+    REPEAT_EPS = 1e-3  # a frame within this of the previous one on both axes is a repeat
+
+    def __init__(self, horizon=0.05, timeout=0.35, decay=0.25, smoothing=0.5, max_rate=3.0, neutral=0.02,
+                 max_gap=0.05):
+        self.horizon = horizon      # s of (tapered) extrapolation past the last frame
+        self.timeout = timeout      # s without frames before decaying to neutral (None = hold forever)
+        self.decay = decay          # s to ramp from held value to neutral
+        self.smoothing = smoothing  # EMA weight of the newest rate estimate (0..1)
+        self.max_rate = max_rate    # clamp on |d(stick)/dt| per axis, 1/s
+        self.neutral = neutral      # samples below this magnitude are treated as a release
+        self.max_gap = max_gap      # s between frames beyond which their difference is not a slope
+        self.reset()
+
+    def reset(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+        self.t = None
+        self.samples = 0
+        self._err_sq = 0.0
+        self.max_error = 0.0
+
+    def configure(self, params):
+        """Apply tunables from a dict (unknown keys ignored); returns the active parameters."""
+        for key in self.PARAMS:
+            if key not in params:
+                continue
+            value = params[key]
+            if key == "timeout" and (value is None or value is False):
+                self.timeout = None
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if math.isfinite(value) and value >= 0:
+                setattr(self, key, value)
+        self.smoothing = min(1.0, self.smoothing)
+        return self.params()
+
+    def params(self):
+        return {key: getattr(self, key) for key in self.PARAMS}
+
+    def update(self, x, y, now=None):
+        """Record a new stick sample and refresh the rate estimate."""
+        now = time.monotonic() if now is None else now
+        x = _clamp1(float(x))
+        y = _clamp1(float(y))
+        if self.t is not None:
+            dt = now - self.t
+            if self.timeout is None or dt <= self.timeout:
+                # Prediction error: what we were applying at arrival time vs what actually arrived
+                px, py = self.predict(now)
+                err = math.hypot(x - px, y - py)
+                self._err_sq += err * err
+                self.max_error = max(self.max_error, err)
+                self.samples += 1
+            repeat = abs(x - self.x) < self.REPEAT_EPS and abs(y - self.y) < self.REPEAT_EPS
+            if math.hypot(x, y) < self.neutral or repeat or dt > self.max_gap:
+                # Release, held stick (keepalive) or a gap too long for a slope: hold, don't lead
+                self.vx = self.vy = 0.0
+            else:
+                dt = max(dt, 0.005)  # bursty stdin drains can deliver samples back to back
+                a = self.smoothing
+                rx = max(-self.max_rate, min(self.max_rate, (x - self.x) / dt))
+                ry = max(-self.max_rate, min(self.max_rate, (y - self.y) / dt))
+                self.vx = a * rx + (1 - a) * self.vx
+                self.vy = a * ry + (1 - a) * self.vy
+        self.x, self.y, self.t = x, y, now
+
+    def predict(self, now=None):
+        """Stick value to apply at `now`."""
+        if self.t is None:
+            return 0.0, 0.0
+        now = time.monotonic() if now is None else now
+        age = max(0.0, now - self.t)
+        if age < self.horizon:
+            # Lead rises then tapers to zero at the horizon (peak horizon / 4 at mid-horizon)
+            lead = age * (1.0 - age / self.horizon)
+            px = self._extrapolate(self.x, self.vx, lead)
+            py = self._extrapolate(self.y, self.vy, lead)
+        else:
+            # Past the horizon the slope is stale: use what was actually received
+            px, py = self.x, self.y
+        if self.timeout is not None and age > self.timeout:
+            fade = 1.0 - (age - self.timeout) / self.decay if self.decay > 0 else 0.0
+            if fade <= 0:
+                return 0.0, 0.0
+            px *= fade
+            py *= fade
+        return px, py
+
+    def _extrapolate(self, value, rate, lead):
+        p = _clamp1(value + rate * lead)
+        # Only a received frame may release or reverse a stick; extrapolation never crosses neutral
+        if p * value < 0 or (abs(value) >= self.neutral and abs(p) < self.neutral):
+            return value
+        return p
+
+    def stats(self, now=None):
+        now = time.monotonic() if now is None else now
+        rms = math.sqrt(self._err_sq / self.samples) if self.samples else 0.0
+        return {
+            "samples": self.samples,
+            "error_rms": round(rms, 4),
+            "error_max": round(self.max_error, 4),
+            "age": round(now - self.t, 3) if self.t is not None else None,
+        }
@@ -0,0 +1,116 @@
+import time
+
+MAX_SEGMENTS = 64
+MAX_SEGMENT_SECONDS = 30.0
+MAX_TOTAL_SECONDS = 120.0
+
+
+def _clamp(v, lo, hi):
+    return max(lo, min(hi, v))
+
+
+def parse_segment(raw):
+    """Validate one timed segment; raises ValueError with a message for the dashboard.
+
+    Segment keys (all but duration optional):
+      duration  seconds this segment lasts
+      drive     {"x", "y"} analog vector, same mapping as the drive joystick
+      keys      WASD list, same mapping as the keyboard
+      spin      -1 / +1 slow tank turn at quick-turn speed
+      gimbal    {"pan", "tilt"} absolute angles in degrees, applied at segment start
+      laser     true / false, applied at segment start
+      label     free text echoed in progress reports
+    No drive/keys/spin means the wheels are stopped for the segment.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("segment must be an object")
+    try:
+        duration = float(raw.get("duration"))
+    except (TypeError, ValueError):
+        raise ValueError("segment duration must be a number")
+    if not 0 < duration <= MAX_SEGMENT_SECONDS:
+        raise ValueError("segment duration must be in (0, %g] s" % MAX_SEGMENT_SECONDS)
+    seg = {"duration": duration, "label": raw.get("label")}
+    modes = [key for key in ("drive", "keys", "spin") if raw.get(key) is not None]
+    if len(modes) > 1:
+        raise ValueError("segment may set only one of drive, keys, spin (got %s)" % ", ".join(modes))
+    if "drive" in modes:
+        d = raw["drive"]
+        if not isinstance(d, dict):
+            raise ValueError("segment drive must be an object with x, y")
+        seg["drive"] = (_clamp(float(d.get("x", 0) or 0), -1.0, 1.0),
+                        _clamp(float(d.get("y", 0) or 0), -1.0, 1.0))
+    elif "keys" in modes:
+        if not isinstance(raw["keys"], list):
+            raise ValueError("segment keys must be a list")
+        seg["keys"] = [k for k in raw["keys"] if k in ("w", "a", "s", "d")]
+    elif "spin" in modes:
+        spin = raw["spin"]
+        # type() check: bool is an int subclass and 1.0 == 1, neither is a valid direction
+        if type(spin) is not int or spin not in (-1, 1):
+            raise ValueError("segment spin must be -1 or 1")
+        seg["spin"] = spin
+    if isinstance(raw.get("gimbal"), dict):
+        g = raw["gimbal"]
+        seg["gimbal"] = (_clamp(float(g.get("pan", 90.0)), 0.0, 180.0),
+                         _clamp(float(g.get("tilt", 90.0)), 0.0, 180.0))
+    if "laser" in raw:
+        seg["laser"] = bool(raw["laser"])
+    return seg
+
+
+class MotionSequence:
+    """A list of timed segments scheduled against one monotonic start time.
+
+    Segment boundaries are absolute offsets from the start, so tick jitter never accumulates
+    into later segments; precision is bounded by how often the driver loop calls advance().
+    """
+
+    def __init__(self, segments, seq_id=None):
+        if not isinstance(segments, list) or not segments:
+            raise ValueError("segments must be a non-empty list")
+        if len(segments) > MAX_SEGMENTS:
+            raise ValueError("at most %d segments" % MAX_SEGMENTS)
+        self.id = seq_id
+        self.segments = [parse_segment(s) for s in segments]
+        self.ends = []
+        total = 0.0
+        for seg in self.segments:
+            total += seg["duration"]
+            self.ends.append(total)
+        if total > MAX_TOTAL_SECONDS:
+            raise ValueError("program longer than %g s" % MAX_TOTAL_SECONDS)
+        self.duration = total
+        self.index = -1
+        self.started_at = None
+
+    def start(self, now=None):
+        self.started_at = time.monotonic() if now is None else now
+
+    def elapsed(self, now=None):
+        now = time.monotonic() if now is None else now
+        return now - self.started_at
+
+    @property
+    def current(self):
+        return self.segments[self.index] if 0 <= self.index < len(self.segments) else None
+
+    def advance(self, now=None):
+        """Move to the segment scheduled at `now`; returns True when the active segment changed.
+
+        Past the last boundary index == len(segments) and current is None (program finished).
+        """
+        elapsed = self.elapsed(now)
+        index = max(self.index, 0)
+        while index < len(self.ends) and elapsed >= self.ends[index]:
+            index += 1
+        changed = index != self.index
+        self.index = index
+        return changed
+
+    @property
+    def finished(self):
+        return self.index >= len(self.segments)
+
+    def segment_start(self, index):
+        return self.ends[index - 1] if index > 0 else 0.0
@@ -24,6 +24,11 @@ if "BLINKA_FORCECHIP" not in os.environ and sys.platform == "linux":
 
 import IIC
 from adafruit_servokit import ServoKit
+from DriverProfiler import DriverProfiler
+from InputPredictor import InputPredictor
+from FlightRecorder import DRIVE_COLUMNS, open_recorder
+from MotionSequence import MotionSequence
+from WheelSpeedSampler import WheelSpeedSampler
 
 
 class RoverDriver:
@@ -51,12 +56,14 @@ class RoverDriver:
         self.report_interval = 0.025  # ~40 Hz to dashboard
         self.drive_deadzone = 0.025
         self.gimbal_deadzone = 0.012
+        # Extrapolate sticks between late WebSocket frames (tunable via set_predictor)
+        self.drive_predictor = InputPredictor()
+        self.gimbal_predictor = InputPredictor()
 
         self._servo_warned = False
         self._last_throttle = -1
-        self.quick_turn_until = 0.0
         self.quiet_mode = True  # When True, slow steady drive; False = boost (full speed)
-        self.quick_turn_dir = 0  # -1 = left, +1 = right
+        self.sequence = None  # Active MotionSequence (timed drive/gimbal/laser program), if any
         try:
             self.kit = ServoKit(channels=16)
             self.pan_channel = 3
@@ -81,6 +88,19 @@ class RoverDriver:
         self.laser_on = False
         self._laser_pin = None
 
+        # On-demand cProfile window / process stats (start_profile, stop_profile, get_stats)
+        self.profiler = DriverProfiler("rover_driver")
+
+        # Commanded wheel speeds (M1..M4) and flight recorder (memory-mapped segments, see FlightRecorder.py)
+        self.wheel_cmd = [0, 0, 0, 0]
+        self.recorder = open_recorder("rover_driver", DRIVE_COLUMNS)
+        self.record_interval = 1.0 / max(1.0, float(os.environ.get("FLIGHT_RECORDER_HZ", "100")))
+        self._next_record_time = 0.0  # time.monotonic()
+
+        # Measured wheel speed from the 10 ms encoder delta registers (WHEEL_SPEED_HZ, 0 = off)
+        self.speed_sampler = WheelSpeedSampler()
+        self._last_wheel_report = None
+
     def _ensure_laser_pin(self):
         """Lazy-init GPIO17 for laser; no-op if not on Pi or GPIO unavailable."""
         if self._laser_pin is not None:
@@ -173,73 +193,103 @@ class RoverDriver:
         self._last_throttle = throttle_pct
         print(json.dumps({"type": "throttle_update", "throttle": throttle_pct}), flush=True)
 
-    def update_drive(self):
-        """Apply drive commands: analog (400–500) or keyboard WASD. Forward/back corrected for rover wiring."""
-        now = time.time()
-        # Quiet mode: much slower speeds to reduce noise
-        speed_scale = 0.28 if self.quiet_mode else 1.0
-        base = int(self.base_speed * speed_scale)
-        min_s = int(self.min_speed * speed_scale)
-        max_s = int(self.max_speed * speed_scale)
+    def update_wheel_speed(self):
+        """Sample measured wheel speeds and report them next to the commanded throttle when they change."""
+        speeds = self.speed_sampler.sample()
+        if speeds is None:
+            return
+        speeds = [round(v, 1) for v in speeds]
+        stalled = self.speed_sampler.stalled(self.wheel_cmd)
+        throttle = max(0, self._last_throttle)
+        report = (speeds, stalled, throttle)
+        if report == self._last_wheel_report:
+            return
+        self._last_wheel_report = report
+        print(json.dumps({
+            "type": "wheel_speed_update",
+            "speeds": speeds,
+            "throttle": throttle,
+            "stalled": stalled,
+        }), flush=True)
 
-        # Quick 90° turns (triggered via commands, slow to avoid body shake)
-        if self.quick_turn_until > now and self.quick_turn_dir != 0:
-            turn_speed = base * 0.35
-            h = turn_speed if self.quick_turn_dir > 0 else -turn_speed
-            fl, fr = h, -h
-            IIC.control_speed(int(fl), int(fl), int(fr), int(fr))
-            avg = (abs(fl) + abs(fr)) / 2.0
-            self._report_throttle(min(100, (avg / 500.0) * 100))
+    def _set_wheel_speeds(self, left, right):
+        """Closed-loop speed command: M1/M2 left side, M3/M4 right side."""
+        IIC.control_speed(left, left, right, right)
+        self.wheel_cmd = [left, left, right, right]
+
+    def _stop_wheels(self):
+        IIC.control_pwm(0, 0, 0, 0)
+        self.wheel_cmd = [0, 0, 0, 0]
+
+    def _drive_wheels(self, fl, fr):
+        """Command left/right wheel speeds and report throttle; stops (PWM 0) when both are zero."""
+        if fl == 0 and fr == 0:
+            self._stop_wheels()
+            self._report_throttle(0)
             return
-        elif self.quick_turn_until > 0 and self.quick_turn_until <= now:
-            # End of quick turn window
-            self.quick_turn_until = 0.0
-            self.quick_turn_dir = 0
+        self._set_wheel_speeds(int(fl), int(fr))
+        avg = (abs(fl) + abs(fr)) / 2.0
+        self._report_throttle(min(100, (avg / 500.0) * 100))
 
-        if self.analog_drive is not None:
-            x = float(self.analog_drive.get("x", 0) or 0)
-            y = float(self.analog_drive.get("y", 0) or 0)
-            mag = math.sqrt(x * x + y * y)
-            if mag < self.drive_deadzone:
-                IIC.control_pwm(0, 0, 0, 0)
-                self._report_throttle(0)
-                return
-            mag = min(1.0, mag)
-            curve = math.pow(mag, self.speed_curve)  # gentler at low stick
-            speed = min_s + (max_s - min_s) * curve
-            v = -y * speed   # forward/back reversed to match rover
-            h = x * speed
-            if abs(v) < 1 and abs(h) < 1:
-                IIC.control_pwm(0, 0, 0, 0)
-                self._report_throttle(0)
-                return
-            fl = v + h
-            fr = v - h
-            IIC.control_speed(int(fl), int(fl), int(fr), int(fr))
-            avg = (abs(fl) + abs(fr)) / 2.0
-            self._report_throttle(min(100, (avg / 500.0) * 100))
+    def _drive_analog(self, x, y, min_s, max_s):
+        """Joystick vector -> wheel speeds (gentle curve, deadzone)."""
+        mag = math.sqrt(x * x + y * y)
+        if mag < self.drive_deadzone:
+            self._drive_wheels(0, 0)
             return
+        mag = min(1.0, mag)
+        curve = math.pow(mag, self.speed_curve)  # gentler at low stick
+        speed = min_s + (max_s - min_s) * curve
+        v = -y * speed   # forward/back reversed to match rover
+        h = x * speed
+        if abs(v) < 1 and abs(h) < 1:
+            self._drive_wheels(0, 0)
+            return
+        self._drive_wheels(v + h, v - h)
 
-        data = self.active_keys
+    def _drive_keys(self, keys, base):
+        """WASD -> wheel speeds; A/D alone is a tank turn."""
         v, h = 0, 0
-        if "w" in data:
+        if "w" in keys:
             v += base
-        if "s" in data:
+        if "s" in keys:
             v -= base
-        if "a" in data:
+        if "a" in keys:
             h -= base * self.turn_factor
-        if "d" in data:
+        if "d" in keys:
             h += base * self.turn_factor
         if v == 0 and h != 0:
             h = (base * self.tank_turn_factor) if h > 0 else -(base * self.tank_turn_factor)
-        if v != 0 or h != 0:
-            fl, fr = v + h, v - h
-            IIC.control_speed(int(fl), int(fl), int(fr), int(fr))
-            avg = (abs(fl) + abs(fr)) / 2.0
-            self._report_throttle(min(100, (avg / 500.0) * 100))
-        else:
-            IIC.control_pwm(0, 0, 0, 0)
-            self._report_throttle(0)
+        self._drive_wheels(v + h, v - h)
+
+    def update_drive(self):
+        """Apply drive commands: motion program, analog (400–500) or keyboard WASD. Forward/back corrected for rover wiring."""
+        # Quiet mode: much slower speeds to reduce noise
+        speed_scale = 0.28 if self.quiet_mode else 1.0
+        base = int(self.base_speed * speed_scale)
+        min_s = int(self.min_speed * speed_scale)
+        max_s = int(self.max_speed * speed_scale)
+
+        seg = self.sequence.current if self.sequence is not None else None
+        if seg is not None:
+            if "drive" in seg:
+                self._drive_analog(seg["drive"][0], seg["drive"][1], min_s, max_s)
+            elif "keys" in seg:
+                self._drive_keys(seg["keys"], base)
+            elif "spin" in seg:
+                # Slow tank turn (same speed as the old quick 90° turn, avoids body shake)
+                h = base * 0.35 * seg["spin"]
+                self._drive_wheels(h, -h)
+            else:
+                self._drive_wheels(0, 0)
+            return
+
+        if self.analog_drive is not None:
+            x, y = self.drive_predictor.predict()
+            self._drive_analog(x, y, min_s, max_s)
+            return
+
+        self._drive_keys(self.active_keys, base)
 
     def update_servos(self):
         """Main loop logic for movement and power management."""
@@ -249,11 +299,7 @@ class RoverDriver:
 
         # Gimbal: analog (all directions reversed to match hardware) or arrow keys
         if self.analog_gimbal is not None:
-            try:
-                gx = float(self.analog_gimbal.get("x", 0) or 0)
-                gy = float(self.analog_gimbal.get("y", 0) or 0)
-            except (TypeError, ValueError):
-                gx, gy = 0.0, 0.0
+            gx, gy = self.gimbal_predictor.predict()
             in_deadzone = not (abs(gx) > self.gimbal_deadzone or abs(gy) > self.gimbal_deadzone)
             if not in_deadzone:
                 rate = self.analog_gimbal_scale * dt
@@ -290,8 +336,110 @@ class RoverDriver:
             else:
                 self.relax_servos()
 
+    def update_profiler(self):
+        """Emit the profile report once a bounded profiling window expires."""
+        report = self.profiler.poll()
+        if report is not None:
+            print(json.dumps(report), flush=True)
+
+    def update_recorder(self):
+        """Append commanded state to the flight recorder at record_interval."""
+        if self.recorder is None:
+            return
+        now = time.monotonic()
+        if now < self._next_record_time:
+            return
+        self._next_record_time = now + self.record_interval
+        w = self.wheel_cmd
+        m = self.speed_sampler.speeds
+        self.recorder.append((now, w[0], w[1], w[2], w[3], m[0], m[1], m[2], m[3],
+                              self.pan_angle, self.tilt_angle, self.laser_on))
+
+    def _predictor_report(self):
+        """Sends predictor parameters and prediction error to stdout."""
+        print(json.dumps({
+            "type": "predictor_stats",
+            "drive": {**self.drive_predictor.params(), **self.drive_predictor.stats()},
+            "gimbal": {**self.gimbal_predictor.params(), **self.gimbal_predictor.stats()},
+        }), flush=True)
+
+    def start_sequence(self, segments, seq_id=None):
+        """Run a timed motion program on the driver's monotonic clock (replaces any running one)."""
+        try:
+            sequence = MotionSequence(segments, seq_id)
+        except (TypeError, ValueError) as e:
+            print(json.dumps({"type": "sequence_error", "id": seq_id, "message": str(e)}), flush=True)
+            return
+        if self.sequence is not None:
+            self.cancel_sequence("replaced")
+        self.analog_drive = None
+        self.active_keys = []
+        self.sequence = sequence
+        sequence.start()
+        self.update_sequence()
+
+    def cancel_sequence(self, status="cancelled"):
+        if self.sequence is None:
+            return
+        sequence = self.sequence
+        self.sequence = None
+        print(json.dumps({
+            "type": "sequence_done",
+            "id": sequence.id,
+            "status": status,
+            "segment": sequence.index,
+            "elapsed": round(sequence.elapsed(), 3),
+        }), flush=True)
+
+    def update_sequence(self):
+        """Advance the motion program; applies gimbal/laser and reports progress at segment starts."""
+        sequence = self.sequence
+        if sequence is None or not sequence.advance():
+            return
+        if sequence.finished:
+            self.cancel_sequence("completed")
+            return
+        seg = sequence.current
+        if "gimbal" in seg:
+            self.analog_gimbal = None
+            self.pan_angle, self.tilt_angle = seg["gimbal"]
+            self.apply_servo_positions()
+            self.reset_timer = time.time() + 1.2
+            self.report_angle(force=True)
+        if "laser" in seg and seg["laser"] != self.laser_on:
+            self.set_laser(seg["laser"])
+        elapsed = sequence.elapsed()
+        print(json.dumps({
+            "type": "sequence_progress",
+            "id": sequence.id,
+            "segment": sequence.index,
+            "segments": len(sequence.segments),
+            "label": seg.get("label"),
+            "elapsed": round(elapsed, 3),
+            # How late this segment started vs its schedule (bounded by the loop tick)
+            "late_ms": round((elapsed - sequence.segment_start(sequence.index)) * 1000.0, 2),
+        }), flush=True)
+
+    def _is_operator_drive(self, data):
+        """True if input carries non-neutral WASD or drive stick."""
+        keys = data if isinstance(data, list) else (data.get("keys") if isinstance(data, dict) else None)
+        if isinstance(keys, list):
+            return any(k in ("w", "a", "s", "d") for k in keys)
+        if isinstance(data, dict) and isinstance(data.get("drive"), dict):
+            try:
+                x = float(data["drive"].get("x", 0) or 0)
+                y = float(data["drive"].get("y", 0) or 0)
+            except (TypeError, ValueError):
+                return False
+            return math.sqrt(x * x + y * y) >= self.drive_deadzone
+        return False
+
     def handle_input(self, data):
         """Processes incoming commands from Node.js stdin. List = keyboard (WASD + arrows), dict = joystick analog or command."""
+        profile_msg = self.profiler.handle_command(data)
+        if profile_msg is not None:
+            print(json.dumps(profile_msg), flush=True)
+            return
         if isinstance(data, dict) and data.get("command") == "reset_servos":
             self.reset_servos()
             return
@@ -300,21 +448,35 @@ class RoverDriver:
             return
         if isinstance(data, dict) and data.get("command") == "turn_left_90_slow":
             # Slow ~90° left turn; duration tuned so 2.43s ≈ 90° (was 2.7s → ~100°).
-            self.quick_turn_dir = -1
-            self.quick_turn_until = time.time() + 2.43
-            self.analog_drive = None
-            self.active_keys = []
+            self.start_sequence([{"duration": 2.43, "spin": -1}], data.get("command"))
             return
         if isinstance(data, dict) and data.get("command") == "turn_right_90_slow":
             # Slow ~90° right turn; same duration as left (2.43s ≈ 90°).
-            self.quick_turn_dir = 1
-            self.quick_turn_until = time.time() + 2.43
-            self.analog_drive = None
-            self.active_keys = []
+            self.start_sequence([{"duration": 2.43, "spin": 1}], data.get("command"))
+            return
+        if isinstance(data, dict) and data.get("command") == "run_sequence":
+            self.start_sequence(data.get("segments"), data.get("id"))
+            return
+        if isinstance(data, dict) and data.get("command") == "cancel_sequence":
+            self.cancel_sequence("cancelled")
             return
         if isinstance(data, dict) and data.get("command") == "toggle_laser":
             self.toggle_laser()
             return
+        if isinstance(data, dict) and data.get("command") == "set_predictor":
+            target = data.get("target")
+            if target in (None, "drive"):
+                self.drive_predictor.configure(data)
+            if target in (None, "gimbal"):
+                self.gimbal_predictor.configure(data)
+            self._predictor_report()
+            return
+        if isinstance(data, dict) and data.get("command") == "get_predictor":
+            self._predictor_report()
+            return
+        if self.sequence is not None and self._is_operator_drive(data):
+            # Operator takes over: stick or WASD input aborts the running program
+            self.cancel_sequence("overridden")
         if isinstance(data, dict):
             if "quietMode" in data:
                 self.quiet_mode = bool(data["quietMode"])
@@ -324,6 +486,12 @@ class RoverDriver:
                 self.active_keys = data["keys"]
             elif "drive" in data:
                 self.analog_drive = data["drive"]
+                try:
+                    dx = float(self.analog_drive.get("x", 0) or 0)
+                    dy = float(self.analog_drive.get("y", 0) or 0)
+                except (AttributeError, TypeError, ValueError):
+                    dx, dy = 0.0, 0.0
+                self.drive_predictor.update(dx, dy)
             if "gimbal" in data:
                 g = data["gimbal"]
                 # Keep gimbal mode active; normalize to dict with numeric x,y
@@ -334,6 +502,7 @@ class RoverDriver:
                     }
                 else:
                     self.analog_gimbal = {"x": 0.0, "y": 0.0}
+                self.gimbal_predictor.update(self.analog_gimbal["x"], self.analog_gimbal["y"])
                 # Debug: log incoming gimbal (throttled)
                 gx, gy = self.analog_gimbal["x"], self.analog_gimbal["y"]
                 if abs(gx) > 0.02 or abs(gy) > 0.02:
@@ -353,21 +522,34 @@ if __name__ == "__main__":
         # Tight loop (~1000 Hz) for minimal gimbal latency
         rlist, _, _ = select.select([sys.stdin], [], [], 0.001)
         if rlist:
-            # Drain stdin and apply only the latest command (avoids lag behind mouse burst)
-            last_data = None
+            # Drain stdin. Stick/keys frames collapse to the latest one (avoids lag behind mouse
+            # bursts); one-shot {"command": ...} messages are all applied, in arrival order, with the
+            # frame that preceded each applied first so a late frame cannot override a new program.
+            pending_frame = None
             while True:
                 line = sys.stdin.readline()
                 if not line:
                     break
                 try:
-                    last_data = json.loads(line)
+                    data = json.loads(line)
                 except Exception:
-                    pass
+                    data = None
+                if isinstance(data, dict) and "command" in data:
+                    if pending_frame is not None:
+                        rover.handle_input(pending_frame)
+                        pending_frame = None
+                    rover.handle_input(data)
+                elif data is not None:
+                    pending_frame = data
                 # Non-blocking check: more data available?
                 rlist, _, _ = select.select([sys.stdin], [], [], 0)
                 if not rlist:
                     break
-            if last_data is not None:
-                rover.handle_input(last_data)
+            if pending_frame is not None:
+                rover.handle_input(pending_frame)
+        rover.update_sequence()
         rover.update_drive()
-        rover.update_servos()
\ No newline at end of file
+        rover.update_servos()
+        rover.update_wheel_speed()
+        rover.update_recorder()
+        rover.update_profiler()
\ No newline at end of file
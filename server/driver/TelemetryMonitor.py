@@ -1,9 +1,13 @@
 import IIC
+import os
 import sys
+import select
 import json
 import time
 import math
 import smbus
+from DriverProfiler import DriverProfiler
+from FlightRecorder import TELEMETRY_COLUMNS, open_recorder
 
 bus = smbus.SMBus(1)
 VOLTAGE_REG = 0x08
@@ -54,11 +58,30 @@ class TelemetryMonitor:
 
 if __name__ == "__main__":
     monitor = TelemetryMonitor()
+    profiler = DriverProfiler("telemetry_monitor")
+    recorder = open_recorder("telemetry_monitor", TELEMETRY_COLUMNS)
+    record_interval = 1.0 / max(0.1, float(os.environ.get("FLIGHT_RECORDER_TELEMETRY_HZ", "10")))
+    next_record = time.monotonic()
+
+    def record_sample():
+        """Flight recorder row: all four encoder totals plus battery voltage."""
+        try:
+            IIC.read_all_encoder()
+            voltage = IIC.get_battery_voltage()
+        except Exception as e:
+            sys.stderr.write(f"Recorder Read Error: {e}\n")
+            return
+        recorder.append((time.monotonic(), *IIC.encoder_now, voltage))
     
-    # Standard input loop for Node.js communication
-    for line in sys.stdin:
+    def handle_line(line):
         try:
             cmd = json.loads(line.strip())
+
+            profile_msg = profiler.handle_command(cmd)
+            if profile_msg is not None:
+                print(json.dumps(profile_msg))
+                sys.stdout.flush()
+                return
             
             if cmd.get("command") == "get_telemetry":
                 voltage_reading = monitor.get_voltage() or {"voltage": None, "raw": None}
@@ -77,4 +100,35 @@ if __name__ == "__main__":
                 
         except Exception as e:
             print(json.dumps({"status": "error", "message": str(e)}))
-            sys.stdout.flush()
\ No newline at end of file
+            sys.stdout.flush()
+
+    # Standard input loop for Node.js communication. select() with a timeout (instead of
+    # blocking on stdin) so a profiling window closes on time and the recorder samples at its
+    # own rate between the 1 Hz get_telemetry polls.
+    stdin_fd = sys.stdin.fileno()
+    pending = b""
+    while True:
+        timeout = profiler.time_left()
+        if recorder is not None:
+            until_record = max(0.0, next_record - time.monotonic())
+            timeout = until_record if timeout is None else min(timeout, until_record)
+        rlist, _, _ = select.select([stdin_fd], [], [], timeout)
+        if recorder is not None and time.monotonic() >= next_record:
+            next_record += record_interval
+            if next_record < time.monotonic():
+                next_record = time.monotonic() + record_interval  # fell behind: don't burst to catch up
+            record_sample()
+        report = profiler.poll()
+        if report is not None:
+            print(json.dumps(report))
+            sys.stdout.flush()
+        if not rlist:
+            continue
+        chunk = os.read(stdin_fd, 4096)
+        if not chunk:
+            break
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for raw in lines:
+            if raw.strip():
+                handle_line(raw.decode("utf-8", "replace"))
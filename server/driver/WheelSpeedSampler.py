@@ -0,0 +1,70 @@
+import os
+import sys
+import math
+import time
+
+import IIC
+
+# Wheel / encoder model — must stay aligned with TelemetryMonitor.py and server/src/constants/roverOdometry.js
+PULSES_PER_WHEEL_REV = 11 * 30 * 10
+WHEEL_DIAMETER_MM = 60.0
+# The board's 0x10-0x13 registers hold encoder ticks counted over the last 10 ms window
+DELTA_WINDOW_S = 0.01
+MM_PER_S_PER_DELTA = (WHEEL_DIAMETER_MM * math.pi / PULSES_PER_WHEEL_REV) / DELTA_WINDOW_S
+STALL_SPEED_MM_S = 5.0  # below this while commanded counts as stalled
+# Spin-up grace: a wheel only counts as stalled once it has been commanded the same direction this long
+STALL_GRACE_S = float(os.environ.get("WHEEL_STALL_GRACE_MS", "300")) / 1000.0
+
+
+class WheelSpeedSampler:
+    """Samples the per-10 ms encoder delta registers and converts them to mm/s per wheel (M1..M4)."""
+
+    def __init__(self, rate_hz=None):
+        if rate_hz is None:
+            rate_hz = float(os.environ.get("WHEEL_SPEED_HZ", "10"))
+        self.enabled = rate_hz > 0
+        self.interval = 1.0 / rate_hz if self.enabled else 0.0
+        self.speeds = [0.0, 0.0, 0.0, 0.0]
+        self.stall_grace = STALL_GRACE_S
+        self._cmd_sign = [0, 0, 0, 0]
+        self._cmd_since = [0.0, 0.0, 0.0, 0.0]
+        self._next_sample = 0.0
+        self._warned = False
+
+    def sample(self, now=None):
+        """Read the registers if the next sample is due; returns the new speeds or None."""
+        if not self.enabled:
+            return None
+        now = time.monotonic() if now is None else now
+        if now < self._next_sample:
+            return None
+        self._next_sample = now + self.interval
+        try:
+            deltas = IIC.read_10_encoder_raw()
+        except Exception as e:
+            if not self._warned:
+                self._warned = True
+                sys.stderr.write("[speed] Encoder delta read failed: %s\n" % e)
+                sys.stderr.flush()
+            return None
+        k = MM_PER_S_PER_DELTA
+        self.speeds = [deltas[0] * k, deltas[1] * k, deltas[2] * k, deltas[3] * k]
+        return self.speeds
+
+    def stalled(self, wheel_cmd, now=None):
+        """Per wheel: commanded to move for at least stall_grace but measured speed is ~0.
+
+        The command is observed when this is called (once per sample), so the grace runs from the
+        first sample that saw the wheel commanded in its current direction; stopping or reversing
+        restarts it.
+        """
+        now = time.monotonic() if now is None else now
+        result = []
+        for i, (cmd, speed) in enumerate(zip(wheel_cmd, self.speeds)):
+            sign = (cmd > 0) - (cmd < 0)
+            if sign != self._cmd_sign[i]:
+                self._cmd_sign[i] = sign
+                self._cmd_since[i] = now
+            result.append(sign != 0 and now - self._cmd_since[i] >= self.stall_grace
+                          and abs(speed) < STALL_SPEED_MM_S)
+        return result
@@ -0,0 +1,69 @@
+import time
+import shutil
+import tempfile
+import unittest
+
+from FlightRecorder import HEADER_SIZE, FlightRecorder, load_segment
+
+COLUMNS = (("t", "d"), ("cmd", "h"), ("laser", "B"))
+# 10 rows per segment: 11-byte rows, plus one 8-byte alignment pad per column
+SEGMENT_BYTES = HEADER_SIZE + 8 * len(COLUMNS) + 10 * 11
+
+
+class FlightRecorderTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def recorder(self, max_segments=8):
+        rec = FlightRecorder("test", COLUMNS, directory=self.dir, segment_bytes=SEGMENT_BYTES)
+        rec.max_segments = max_segments
+        self.addCleanup(rec.close)
+        return rec
+
+    def rows(self, rec):
+        rec.close()
+        return [load_segment(path) for path in rec.segments()]
+
+    def test_append_load_round_trip(self):
+        rec = self.recorder()
+        self.assertEqual(rec.capacity, 10)
+        wall, mono = time.time(), time.monotonic()
+        for i in range(4):
+            rec.append((mono + i * 0.01, i - 2, i % 2))
+        with self.assertRaises(ValueError):
+            rec.append((mono, 1))
+        # Readable while still mapped: the row count lives in the shared header
+        seg = load_segment(rec.path)
+        self.assertEqual(list(seg["columns"]["cmd"]), [-2, -1, 0, 1])
+        self.assertEqual(list(seg["columns"]["laser"]), [0, 1, 0, 1])
+        self.assertAlmostEqual(seg["columns"]["t"][3], mono + 0.03)
+        self.assertAlmostEqual(seg["wall_clock"], wall, delta=1.0)
+        self.assertAlmostEqual(seg["monotonic"], mono, delta=1.0)
+
+    def test_rotation_keeps_every_row(self):
+        rec = self.recorder()
+        for i in range(25):
+            rec.append((float(i), i, 0))
+        segments = self.rows(rec)
+        self.assertEqual([len(s["columns"]["t"]) for s in segments], [10, 10, 5])
+        self.assertEqual([v for s in segments for v in s["columns"]["cmd"]], list(range(25)))
+        # Each segment pins the clocks at the moment it started recording
+        starts = [s["monotonic"] for s in segments]
+        self.assertEqual(starts, sorted(starts))
+
+    def test_prune_caps_segment_count(self):
+        rec = self.recorder(max_segments=3)
+        for i in range(60):
+            rec.append((float(i), i, 0))
+            # Never more than max_segments files, counting the preallocated next one
+            rec._preparer.join()
+            self.assertLessEqual(len(rec.segments()), 3)
+        segments = self.rows(rec)
+        # close() drops the unused preallocated segment; the two newest full ones remain
+        self.assertEqual(len(segments), 2)
+        self.assertEqual([v for s in segments for v in s["columns"]["cmd"]], list(range(40, 60)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from InputPredictor import InputPredictor
+
+
+class InputPredictorTest(unittest.TestCase):
+    def feed(self, predictor, values, start=0.0, step=0.03):
+        t = start
+        for v in values:
+            predictor.update(v, 0.0, now=t)
+            t += step
+        return t - step
+
+    def test_ramp_then_hold_bounds_overshoot_and_is_continuous(self):
+        p = InputPredictor()
+        # 0 -> 0.5 over ~100 ms at 60 Hz, then the stick stops moving (no frames until keepalive)
+        t = self.feed(p, [i / 12.0 for i in range(7)], step=1 / 60.0)
+        outputs = [p.predict(t + ms / 1000.0)[0] for ms in range(0, 101)]
+        self.assertLessEqual(max(outputs), 0.5 + p.max_rate * p.horizon / 4 + 1e-9)
+        # No step anywhere, in particular not where the horizon runs out
+        steps = [abs(b - a) for a, b in zip(outputs, outputs[1:])]
+        self.assertLess(max(steps), 0.01)
+        self.assertAlmostEqual(p.predict(t + p.horizon)[0], 0.5)
+
+    def test_keepalive_repeats_do_not_restart_extrapolation(self):
+        p = InputPredictor()
+        t = self.feed(p, [0.2, 0.3, 0.4, 0.5], step=1 / 60.0)
+        for k in range(1, 5):
+            p.update(0.5, 0.0, now=t + 0.1 * k)
+            self.assertEqual((p.vx, p.vy), (0.0, 0.0))
+            for ms in (5, 25, 60):
+                self.assertAlmostEqual(p.predict(t + 0.1 * k + ms / 1000.0)[0], 0.5)
+
+    def test_slow_frames_carry_no_slope(self):
+        p = InputPredictor()
+        self.feed(p, [0.2, 0.4], step=0.2)
+        self.assertEqual((p.vx, p.vy), (0.0, 0.0))
+
+    def test_easing_off_never_extrapolates_to_neutral(self):
+        p = InputPredictor(timeout=None)
+        t = self.feed(p, [0.8, 0.55, 0.3], step=1 / 60.0)
+        for dt in (0.01, 0.05, 0.1, 0.5):
+            self.assertGreater(p.predict(t + dt)[0], 0.0)
+        self.assertAlmostEqual(p.predict(t + 0.5)[0], 0.3)
+
+    def test_lost_frames_decay_to_neutral(self):
+        p = InputPredictor(timeout=0.35, decay=0.25)
+        t = self.feed(p, [0.9, 0.9, 0.9])
+        self.assertAlmostEqual(p.predict(t + 0.3)[0], 0.9)
+        self.assertLess(p.predict(t + 0.5)[0], 0.9)
+        self.assertEqual(p.predict(t + 0.7), (0.0, 0.0))
+
+    def test_release_is_not_extrapolated(self):
+        p = InputPredictor()
+        t = self.feed(p, [0.9, 0.5, 0.0], step=1 / 60.0)
+        self.assertEqual(p.predict(t + 0.05), (0.0, 0.0))
+
+    def test_configure_timeout_off(self):
+        p = InputPredictor()
+        self.assertIsNone(p.configure({"timeout": None})["timeout"])
+        t = self.feed(p, [0.7])
+        self.assertAlmostEqual(p.predict(t + 30.0)[0], 0.7)
+
+
+if __name__ == "__main__":
+    unittest.main()
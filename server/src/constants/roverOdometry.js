@@ -1,6 +1,6 @@
 /**
  * Wheel / encoder model — must stay aligned with server/driver/TelemetryMonitor.py
- * (ppr, diameter, distance integration on M1).
+ * (ppr, diameter, distance integration on M1) and server/driver/WheelSpeedSampler.py (mm/s).
  */
 export const ROVER_ODOMETRY = {
   referenceMotor: "M1",
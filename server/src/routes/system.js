@@ -6,10 +6,16 @@ import { stateService } from "../services/stateService.js";
 import { success, error, badRequest, asyncHandler } from "../utils/apiResponse.js";
 import { speak } from "../utils/sysUtils.js";
 import { recordTelemetry } from "../services/telemetryService.js";
+import { driverService } from "../services/driverService.js";
 
 const router = express.Router();
 const execPromise = util.promisify(exec);
 
+const PROFILE_TARGETS = ["motor", "telemetry"];
+const PROFILE_COMMANDS = { start: "start_profile", stop: "stop_profile", stats: "get_stats" };
+const PREDICTOR_TARGETS = ["drive", "gimbal"];
+const PREDICTOR_PARAMS = ["horizon", "timeout", "decay", "smoothing", "max_rate", "neutral", "max_gap"];
+
 router.post(
   "/shutdown",
   asyncHandler((req, res) => {
@@ -69,4 +75,64 @@ router.post(
   }),
 );
 
+router.get("/profile", (req, res) => {
+  success(res, { reports: driverService.profileReports });
+});
+
+router.post(
+  "/profile",
+  asyncHandler((req, res) => {
+    const { target, action, duration, top } = req.body ?? {};
+    if (!PROFILE_TARGETS.includes(target)) {
+      return badRequest(res, "target must be 'motor' or 'telemetry'");
+    }
+    const command = PROFILE_COMMANDS[action];
+    if (!command) {
+      return badRequest(res, "action must be 'start', 'stop' or 'stats'");
+    }
+    const payload = { command };
+    if (action === "start") {
+      if (duration !== undefined) payload.duration = duration;
+      if (top !== undefined) payload.top = top;
+    }
+    if (!driverService.sendDriverCommand(target, payload)) {
+      return error(res, `${target} driver process is not running`, 503);
+    }
+    // Reports arrive asynchronously: GET /profile or the DRIVER_PROFILE WebSocket broadcast
+    success(res, { accepted: true, target, command });
+  }),
+);
+
+router.get("/predictor", (req, res) => {
+  success(res, { predictor: driverService.predictorStats });
+});
+
+router.post(
+  "/predictor",
+  asyncHandler((req, res) => {
+    const { target, ...body } = req.body ?? {};
+    if (target !== undefined && !PREDICTOR_TARGETS.includes(target)) {
+      return badRequest(res, "target must be 'drive' or 'gimbal' (omit for both)");
+    }
+    const params = {};
+    for (const key of PREDICTOR_PARAMS) {
+      if (body[key] === undefined) continue;
+      const value = body[key];
+      if (!(value === null && key === "timeout") && !(Number.isFinite(value) && value >= 0)) {
+        return badRequest(res, `${key} must be a non-negative number`);
+      }
+      params[key] = value;
+    }
+    // No parameters: just ask for the current stats
+    const payload = Object.keys(params).length
+      ? { command: "set_predictor", ...(target ? { target } : {}), ...params }
+      : { command: "get_predictor" };
+    if (!driverService.sendDriverCommand("motor", payload)) {
+      return error(res, "motor driver process is not running", 503);
+    }
+    // Stats arrive asynchronously: GET /predictor or the PREDICTOR_STATS WebSocket broadcast
+    success(res, { accepted: true, command: payload.command });
+  }),
+);
+
 export default router;
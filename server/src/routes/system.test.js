@@ -30,12 +30,22 @@ vi.mock("../services/telemetryService.js", async (importOriginal) => {
   };
 });
 
+vi.mock("../services/driverService.js", () => ({
+  driverService: {
+    sendDriverCommand: vi.fn(() => true),
+    profileReports: { motor: { type: "profile_report", hotspots: [] }, telemetry: null },
+    predictorStats: { drive: { horizon: 0.05, error_rms: 0.02 }, gimbal: null },
+  },
+}));
+
 import { createHttpApp } from "../createHttpApp.js";
+import { driverService } from "../services/driverService.js";
 import { stateService } from "../services/stateService.js";
 
 describe("/api/system", () => {
   beforeEach(() => {
     writeFileSyncMock.mockClear();
+    vi.mocked(driverService.sendDriverCommand).mockClear();
     stateService.quietMode = true;
   });
 
@@ -72,4 +82,60 @@ describe("/api/system", () => {
       "rebooting",
     );
   });
+
+  it("POST profile validates target and action", async () => {
+    const app = createHttpApp();
+    const badTarget = await request(app).post("/api/system/profile").send({ target: "x", action: "start" });
+    expect(badTarget.status).toBe(400);
+    const badAction = await request(app).post("/api/system/profile").send({ target: "motor", action: "go" });
+    expect(badAction.status).toBe(400);
+    expect(driverService.sendDriverCommand).not.toHaveBeenCalled();
+  });
+
+  it("POST profile start forwards to the telemetry process", async () => {
+    const app = createHttpApp();
+    const res = await request(app)
+      .post("/api/system/profile")
+      .send({ target: "telemetry", action: "start", duration: 5 });
+    expect(res.status).toBe(200);
+    expect(driverService.sendDriverCommand).toHaveBeenCalledWith("telemetry", {
+      command: "start_profile",
+      duration: 5,
+    });
+  });
+
+  it("POST profile returns 503 when the process is down", async () => {
+    vi.mocked(driverService.sendDriverCommand).mockReturnValueOnce(false);
+    const app = createHttpApp();
+    const res = await request(app).post("/api/system/profile").send({ target: "motor", action: "stop" });
+    expect(res.status).toBe(503);
+  });
+
+  it("GET profile returns last reports", async () => {
+    const app = createHttpApp();
+    const res = await request(app).get("/api/system/profile");
+    expect(res.status).toBe(200);
+    expect(res.body.reports.motor.type).toBe("profile_report");
+  });
+
+  it("POST predictor forwards parameters to the motor process", async () => {
+    const app = createHttpApp();
+    const res = await request(app).post("/api/system/predictor").send({ target: "gimbal", horizon: 0.03 });
+    expect(res.status).toBe(200);
+    expect(driverService.sendDriverCommand).toHaveBeenCalledWith("motor", {
+      command: "set_predictor",
+      target: "gimbal",
+      horizon: 0.03,
+    });
+    const bad = await request(app).post("/api/system/predictor").send({ max_rate: -1 });
+    expect(bad.status).toBe(400);
+  });
+
+  it("POST predictor without parameters requests stats; GET returns the last", async () => {
+    const app = createHttpApp();
+    await request(app).post("/api/system/predictor").send({});
+    expect(driverService.sendDriverCommand).toHaveBeenCalledWith("motor", { command: "get_predictor" });
+    const res = await request(app).get("/api/system/predictor");
+    expect(res.body.predictor.drive.error_rms).toBe(0.02);
+  });
 });
@@ -30,12 +30,74 @@ export class DriverService {
     /** @type {((n: number) => void) | null} */
     this._distanceFreshResolve = null;
     this._distanceFreshTimer = null;
+    /** Last profile/process stats message per driver process (start_profile, stop_profile, get_stats). */
+    this.profileReports = { motor: null, telemetry: null };
+    /** Last stick predictor parameters and prediction error from RoverDriver ({ drive, gimbal }). */
+    this.predictorStats = null;
   }
 
   setBroadcast(fn) {
     this.broadcast = fn || (() => {});
   }
 
+  /**
+   * Profiler messages from either Python process: keep the latest, log and forward to the dashboard.
+   * @returns {boolean} true if the message was a profiler message
+   */
+  handleProfileMessage(source, data) {
+    if (
+      data.type !== "profile_status" &&
+      data.type !== "profile_report" &&
+      data.type !== "process_stats"
+    ) {
+      return false;
+    }
+    this.profileReports[source] = data;
+    if (data.type === "profile_report") {
+      logger.info(
+        { source, elapsed: data.elapsed, file: data.file, hotspots: data.hotspots?.slice(0, 5) },
+        "Driver profile report",
+      );
+    } else {
+      logger.info({ source, ...data }, "Driver profiler");
+    }
+    // Nested under one key: the dashboard merges every broadcast's data into its flat stats object
+    this.broadcast({ type: "DRIVER_PROFILE", data: { driverProfile: { ...this.profileReports } } });
+    return true;
+  }
+
+  /** Motion program progress from RoverDriver (run_sequence / turn_*_90_slow). */
+  handleSequenceMessage(data) {
+    const prev = stateService.motionSequence;
+    const sameProgram = prev && prev.id === (data.id ?? null);
+    if (data.type === "sequence_progress") {
+      stateService.motionSequence = {
+        id: data.id ?? null,
+        status: "running",
+        segment: data.segment,
+        segments: data.segments,
+        label: data.label ?? null,
+        elapsed: data.elapsed,
+        lateMs: data.late_ms,
+      };
+      logger.debug({ sequence: stateService.motionSequence }, "Motion sequence progress");
+    } else if (data.type === "sequence_done") {
+      stateService.motionSequence = {
+        ...(sameProgram ? prev : {}),
+        id: data.id ?? null,
+        status: data.status,
+        segment: data.segment,
+        elapsed: data.elapsed,
+      };
+      logger.info({ sequence: stateService.motionSequence }, "Motion sequence finished");
+    } else {
+      stateService.motionSequence = { id: data.id ?? null, status: "error", error: data.message };
+      logger.warn({ id: data.id, message: data.message }, "Motion sequence rejected");
+    }
+    // Nested like /health: the dashboard merges every broadcast's data into its flat stats object
+    this.broadcast({ type: "MOTION_SEQUENCE", data: { motionSequence: stateService.motionSequence } });
+  }
+
   start() {
     this.initMotor();
     this.initTelemetry();
@@ -73,11 +135,40 @@ export class DriverService {
           this.broadcast({ type: "THROTTLE_UPDATE", data: { throttle } });
         }
 
+        if (data.type === "wheel_speed_update") {
+          stateService.wheelSpeeds = Array.isArray(data.speeds) ? data.speeds : null;
+          stateService.wheelStalled = Array.isArray(data.stalled) ? data.stalled : null;
+          this.broadcast({
+            type: "WHEEL_SPEED_UPDATE",
+            data: {
+              wheelSpeeds: stateService.wheelSpeeds,
+              wheelStalled: stateService.wheelStalled,
+              throttle: data.throttle ?? stateService.throttle,
+            },
+          });
+        }
+
+        if (data.type === "predictor_stats") {
+          this.predictorStats = { drive: data.drive ?? null, gimbal: data.gimbal ?? null };
+          logger.info(this.predictorStats, "Stick predictor");
+          this.broadcast({ type: "PREDICTOR_STATS", data: { predictorStats: this.predictorStats } });
+        }
+
+        if (
+          data.type === "sequence_progress" ||
+          data.type === "sequence_done" ||
+          data.type === "sequence_error"
+        ) {
+          this.handleSequenceMessage(data);
+        }
+
         if (data.type === "laser_update") {
           stateService.laserOn = Boolean(data.on);
           this.broadcast({ type: "LASER_UPDATE", data: { laserOn: stateService.laserOn } });
         }
 
+        this.handleProfileMessage("motor", data);
+
         // 2. Handle the "Ready" status from __main__
         if (data.status === "ready") {
           console.log("✅ Rover Python Driver is online and calibrated.");
@@ -118,6 +209,7 @@ export class DriverService {
     this.telemetryShell.on("message", (message) => {
       try {
         const data = JSON.parse(message);
+        if (this.handleProfileMessage("telemetry", data)) return;
         if (data.type === "telemetry") {
           const parsedVoltage = Number(data.voltage);
           stateService.currentVoltage = Number.isFinite(parsedVoltage) ? parsedVoltage : 0;
@@ -176,6 +268,24 @@ export class DriverService {
     }
   }
 
+  /**
+   * Send a raw command object to one Python process ("motor" or "telemetry").
+   * @returns {boolean} false when that process is not running
+   */
+  sendDriverCommand(target, payload) {
+    const shellKey = target === "telemetry" ? "telemetryShell" : "motorShell";
+    const shell = this[shellKey];
+    if (!shell) return false;
+    try {
+      shell.send(JSON.stringify(payload));
+      return true;
+    } catch (err) {
+      if (err.code !== "EPIPE") console.warn("Driver send error:", err.message);
+      this[shellKey] = null;
+      return false;
+    }
+  }
+
   requestTelemetry() {
     if (!this.telemetryShell) return;
     try {
@@ -22,6 +22,7 @@ vi.mock("./autoDocker.js", () => ({
 
 import { PythonShell } from "python-shell";
 import { DriverService } from "./driverService.js";
+import { stateService } from "./stateService.js";
 
 describe("DriverService", () => {
   beforeEach(() => {
@@ -59,6 +60,112 @@ describe("DriverService", () => {
     });
   });
 
+  it("wheel_speed_update from motor shell updates state and broadcasts", () => {
+    const d = new DriverService();
+    const broadcast = vi.fn();
+    d.setBroadcast(broadcast);
+    d.initMotor();
+    const onMessage = d.motorShell.on.mock.calls.find(([event]) => event === "message")[1];
+    onMessage(
+      JSON.stringify({
+        type: "wheel_speed_update",
+        speeds: [120.5, 118, 0, 121],
+        throttle: 22.4,
+        stalled: [false, false, true, false],
+      }),
+    );
+    expect(stateService.wheelSpeeds).toEqual([120.5, 118, 0, 121]);
+    expect(stateService.wheelStalled).toEqual([false, false, true, false]);
+    expect(broadcast).toHaveBeenCalledWith({
+      type: "WHEEL_SPEED_UPDATE",
+      data: {
+        wheelSpeeds: [120.5, 118, 0, 121],
+        wheelStalled: [false, false, true, false],
+        throttle: 22.4,
+      },
+    });
+  });
+
+  it("sequence messages update motionSequence state and broadcast", () => {
+    const d = new DriverService();
+    const broadcast = vi.fn();
+    d.setBroadcast(broadcast);
+    d.initMotor();
+    const onMessage = d.motorShell.on.mock.calls.find(([event]) => event === "message")[1];
+    onMessage(
+      JSON.stringify({
+        type: "sequence_progress",
+        id: "dock",
+        segment: 1,
+        segments: 3,
+        label: "back",
+        elapsed: 1.2,
+        late_ms: 0.4,
+      }),
+    );
+    expect(stateService.motionSequence).toMatchObject({ id: "dock", status: "running", segment: 1 });
+    onMessage(JSON.stringify({ type: "sequence_done", id: "dock", status: "cancelled", segment: 1, elapsed: 1.5 }));
+    expect(stateService.motionSequence).toMatchObject({
+      id: "dock",
+      status: "cancelled",
+      segments: 3,
+      elapsed: 1.5,
+    });
+    expect(broadcast).toHaveBeenLastCalledWith({
+      type: "MOTION_SEQUENCE",
+      data: { motionSequence: stateService.motionSequence },
+    });
+    onMessage(JSON.stringify({ type: "sequence_error", id: "bad", message: "segments must be a non-empty list" }));
+    expect(stateService.motionSequence).toEqual({
+      id: "bad",
+      status: "error",
+      error: "segments must be a non-empty list",
+    });
+  });
+
+  it("predictor_stats is stored and broadcast under one key", () => {
+    const d = new DriverService();
+    const broadcast = vi.fn();
+    d.setBroadcast(broadcast);
+    d.initMotor();
+    const onMessage = d.motorShell.on.mock.calls.find(([event]) => event === "message")[1];
+    const drive = { horizon: 0.05, timeout: 0.35, samples: 120, error_rms: 0.021, error_max: 0.09, age: 0.01 };
+    const gimbal = { horizon: 0.05, timeout: 0.35, samples: 0, error_rms: 0, error_max: 0, age: null };
+    onMessage(JSON.stringify({ type: "predictor_stats", drive, gimbal }));
+    expect(d.predictorStats).toEqual({ drive, gimbal });
+    expect(broadcast).toHaveBeenCalledWith({
+      type: "PREDICTOR_STATS",
+      data: { predictorStats: { drive, gimbal } },
+    });
+  });
+
+  it("profile_report from telemetry shell is stored and broadcast", () => {
+    const d = new DriverService();
+    const broadcast = vi.fn();
+    d.setBroadcast(broadcast);
+    d.initTelemetry();
+    const onMessage = d.telemetryShell.on.mock.calls.find(([event]) => event === "message")[1];
+    const report = { type: "profile_report", name: "telemetry_monitor", hotspots: [], file: "/app/shared/x.prof" };
+    onMessage(JSON.stringify(report));
+    expect(d.profileReports.telemetry).toEqual(report);
+    expect(broadcast).toHaveBeenCalledWith({
+      type: "DRIVER_PROFILE",
+      data: { driverProfile: { motor: null, telemetry: report } },
+    });
+  });
+
+  it("sendDriverCommand targets the requested process", () => {
+    const d = new DriverService();
+    const telemetrySend = vi.fn();
+    d.motorShell = { send: sendMock };
+    d.telemetryShell = { send: telemetrySend };
+    expect(d.sendDriverCommand("telemetry", { command: "stop_profile" })).toBe(true);
+    expect(telemetrySend).toHaveBeenCalledWith(JSON.stringify({ command: "stop_profile" }));
+    expect(sendMock).not.toHaveBeenCalled();
+    d.motorShell = null;
+    expect(d.sendDriverCommand("motor", { command: "get_stats" })).toBe(false);
+  });
+
   it("setBroadcast stores function", () => {
     const d = new DriverService();
     const fn = vi.fn();
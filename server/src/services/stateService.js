@@ -36,6 +36,12 @@ class StateService {
     this.pan = 90;
     this.tilt = 90;
     this.throttle = 0;
+    /** Measured wheel speeds M1..M4 in mm/s from the 10 ms encoder registers (null until first sample). */
+    this.wheelSpeeds = null;
+    /** Per wheel: commanded but not turning. */
+    this.wheelStalled = null;
+    /** Running/last driver motion program: { id, status, segment, segments, elapsed } (null = none yet). */
+    this.motionSequence = null;
     /** KY-008 laser on GPIO17: true = on, false = off. */
     this.laserOn = false;
     /** When true (default), rover uses slow steady speeds; false = boost (full speed). Unrelated to TTS. */
@@ -102,7 +108,10 @@ class StateService {
         pan: this.pan,
         tilt: this.tilt,
         throttle: this.throttle,
+        wheelSpeeds: this.wheelSpeeds,
+        wheelStalled: this.wheelStalled,
         laserOn: this.laserOn,
+        motionSequence: this.motionSequence,
         quietMode: this.quietMode,
         odometry: getOdometryCalibrationSnapshot(this.distance),
       };